@@ -48,4 +48,8 @@ class ActionsReAct:
       
     def execute_terminal_command(self, command: str) -> Tuple[str, str]:
       """Run a terminal command and return stdout/stderr"""
-      return run_terminal_command(self.env, command)
+      try:
+        return run_terminal_command(self.env, command)
+      finally:
+        # The command may have written anywhere in the env, so drop its cached reads
+        read_existing_file.invalidate(self.env)
@@ -10,6 +10,9 @@ Args:
 
 import os
 
+from helpers.utils import atomic_write_bytes
+from .read_existing_file_s import read_existing_file
+
 
 def create_new_file(env, filepath, content=""):
     # Get absolute path by joining env and filepath
@@ -19,8 +22,10 @@ def create_new_file(env, filepath, content=""):
     os.makedirs(os.path.dirname(abs_path), exist_ok=True)
 
     # Create the file and write content if provided
-    with open(abs_path, "w") as f:
-        f.write(content)
+    atomic_write_bytes(abs_path, content.encode("utf-8"))
+
+    # Drop any stale cached read of this file
+    read_existing_file.invalidate(abs_path)
     return True
 
 
@@ -8,6 +8,7 @@ Returns:
   bool: True if deletion was successful, False if file not found
 """
 import os
+from .read_existing_file_s import read_existing_file
 
 def delete_existing_file(env, filepath):
   # Get absolute path by joining env and filepath
@@ -16,13 +17,20 @@ def delete_existing_file(env, filepath):
   try:
     # Delete the file
     os.remove(abs_path)
+    read_existing_file.invalidate(abs_path)
     
     # Get the directory path
     dir_path = os.path.dirname(abs_path)
     
-    # If directory exists and is empty, remove it
-    if os.path.exists(dir_path) and not os.listdir(dir_path):
-      os.rmdir(dir_path)
+    # If directory exists and is empty, remove it. Stops at the first entry instead of listing them all
+    try:
+      with os.scandir(dir_path) as entries:
+        empty = next(entries, None) is None
+      if empty:
+        os.rmdir(dir_path)
+    except OSError:
+      # Directory already gone, or something was written into it in the meantime
+      pass
       
     return True
     
@@ -11,7 +11,13 @@ Returns:
   bool: True if edit was successful, False if file not found
 """
 import os
+import re
 from helpers.ai import ai
+from helpers.utils import atomic_write_text
+from .read_existing_file_s import read_existing_file
+
+# Opening ``` fence, with an optional language identifier
+_OPENING_FENCE_RE = re.compile(r"\A```[^\n]*\n")
 
 def edit_existing_file(env, filepath, query):
   # Get absolute path by joining env and filepath
@@ -31,20 +37,21 @@ def edit_existing_file(env, filepath, query):
     new_content = ai(system_prompt, user_prompt)
     
     # Strip code block markers if present
-    if new_content.startswith("```"):
-      # Find the first newline to skip language identifier if present
-      first_nl = new_content.find("\n")
-      # Remove opening ``` and optional language
-      new_content = new_content[first_nl + 1:]
-      
-    # Remove closing ``` if present  
+    opening_fence = _OPENING_FENCE_RE.match(new_content)
+    if opening_fence:
+      new_content = new_content[opening_fence.end():]
     if new_content.endswith("```"):
       new_content = new_content[:-3]
-      
+
+    # Nothing to write if the edit was a no-op
+    if new_content == current_content:
+      return True
+
     # Write the edited content back to file
-    with open(abs_path, 'w') as f:
-      f.write(new_content)
-      
+    atomic_write_text(abs_path, new_content)
+
+    # Drop any stale cached read of this file
+    read_existing_file.invalidate(abs_path)
     return True
     
   except FileNotFoundError:
@@ -1,46 +1,140 @@
 """Read one or more existing files from the env folder.
 
+Reads are served from an in-process LRU cache keyed by the file's absolute path,
+mtime and size, so re-reading an unchanged file across ReAct iterations skips the disk.
+
 Args:
   env (str): Base folder path
   filepath (str or list): Path(s) to file(s) to read, relative to env
 
 Returns:
-  str or dict: Contents of the file(s). Returns string for single file, 
+  str or dict: Contents of the file(s). Returns string for single file,
                dict mapping filepaths to contents for multiple files.
   None: If file does not exist
 """
 import os
+import mmap
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+# Upper bound on the total size of cached file contents
+MAX_CACHE_BYTES = 256 * 1024 * 1024
+
+# Files larger than this are read through mmap instead of a buffered read
+MMAP_THRESHOLD = 1 << 20
+
+# How both read paths decode files, so a file reads the same whatever its size
+ENCODING = 'utf-8'
+ERRORS = 'replace'
+
+# Multi-file reads of at least this many paths are issued concurrently
+BATCH_READ_MIN = 4
+BATCH_READ_WORKERS = 8
+
+# abs_path -> (st_mtime_ns, st_size, contents), least recently used first
+_cache = OrderedDict()
+_cache_bytes = 0
+_cache_lock = threading.Lock()
+
+def invalidate(path):
+  """Drop the cached contents of `path`, or of every file under it if it is a directory,
+  so the next read goes to disk."""
+  global _cache_bytes
+  abs_path = os.path.abspath(path)
+  with _cache_lock:
+    keys = [abs_path]
+    if os.path.isdir(abs_path):
+      prefix = os.path.join(abs_path, '')
+      keys = [key for key in _cache if key.startswith(prefix)]
+    for key in keys:
+      entry = _cache.pop(key, None)
+      if entry is not None:
+        _cache_bytes -= entry[1]
+
+def _read_mmap(abs_path):
+  """Decode a large file straight from the page cache, or None if it can't be mapped."""
+  with open(abs_path, 'rb') as f:
+    try:
+      mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+      # Pipes, special files and some network filesystems can't be mapped
+      return None
+  with mm, memoryview(mm) as view:
+    text = str(view, ENCODING, errors=ERRORS)
+  # Match the newline translation of a text-mode read
+  if '\r' in text:
+    text = text.replace('\r\n', '\n').replace('\r', '\n')
+  return text
+
+def _read(abs_path):
+  global _cache_bytes
+  key = os.path.abspath(abs_path)
+  st = os.stat(key)
+
+  # Serve unchanged files straight from the cache
+  with _cache_lock:
+    entry = _cache.get(key)
+    if entry is not None and entry[0] == st.st_mtime_ns and entry[1] == st.st_size:
+      _cache.move_to_end(key)
+      return entry[2]
+
+  contents = _read_mmap(key) if st.st_size > MMAP_THRESHOLD else None
+  if contents is None:
+    with open(key, 'r', encoding=ENCODING, errors=ERRORS) as f:
+      contents = f.read()
+
+  with _cache_lock:
+    # Replace any stale entry for this path
+    stale = _cache.pop(key, None)
+    if stale is not None:
+      _cache_bytes -= stale[1]
+    if st.st_size <= MAX_CACHE_BYTES:
+      _cache[key] = (st.st_mtime_ns, st.st_size, contents)
+      _cache_bytes += st.st_size
+      # Evict least recently used entries until we're back under budget
+      while _cache_bytes > MAX_CACHE_BYTES:
+        _, evicted = _cache.popitem(last=False)
+        _cache_bytes -= evicted[1]
+  return contents
+
+def _read_or_none(abs_path):
+  try:
+    return _read(abs_path)
+  except FileNotFoundError:
+    return None
+
+def _batch_read(env, paths):
+  """Read several files at once, overlapping their open/read syscalls on a thread pool."""
+  abs_paths = [os.path.join(env, path) for path in paths]
+  if len(abs_paths) < BATCH_READ_MIN:
+    results = map(_read_or_none, abs_paths)
+  else:
+    with ThreadPoolExecutor(max_workers=min(BATCH_READ_WORKERS, len(abs_paths))) as pool:
+      results = list(pool.map(_read_or_none, abs_paths))
+  return dict(zip(paths, results))
 
 def read_existing_file(env, filepath):
   # Handle single filepath or list of filepaths
   if isinstance(filepath, str):
     # Get absolute path by joining env and filepath
     abs_path = os.path.join(env, filepath)
-    
-    try:
-      # Read and return file contents
-      with open(abs_path, 'r') as f:
-        return f.read()
-    except FileNotFoundError:
-      return None
-  
+
+    # Read and return file contents
+    return _read_or_none(abs_path)
+
   else:
     # Read multiple files and return dict of contents
-    contents = {}
-    for path in filepath:
-      abs_path = os.path.join(env, path)
-      try:
-        with open(abs_path, 'r') as f:
-          contents[path] = f.read()
-      except FileNotFoundError:
-        contents[path] = None
-    return contents
-    
+    return _batch_read(env, list(filepath))
+
+# Write barrier for other actions: `read_existing_file.invalidate(path)`
+read_existing_file.invalidate = invalidate
+
 if __name__ == "__main__":
   # Example with single file
   content = read_existing_file("envs/env_dummy/playground", "test/file.txt")
   print(content)
-  
+
   # Example with multiple files
   contents = read_existing_file("envs/env_dummy/playground", ["test/file1.txt", "test/file.txt", "test/file2.txt"])
   print(contents)
\ No newline at end of file
@@ -15,9 +15,6 @@ def run_terminal_command(env_path, command):
     but it cannot guarantee complete isolation. For true isolation, consider using
     Docker containers.
   """
-  # Store original directory so we can restore it later
-  original_dir = os.getcwd()
-
   # Convert env_path to absolute path
   env_path_abs = Path(os.path.abspath(env_path))
 
@@ -31,23 +28,19 @@ def run_terminal_command(env_path, command):
     if not env_path_abs.is_dir():
       return ("", f"Error: {env_path_abs} is not a valid directory")
 
-    # Change to the target directory
-    os.chdir(env_path_abs)
-    
-    # Run the command directly, capturing stdout and stderr
+    # Run the command directly in the target directory, capturing stdout and stderr.
+    # cwd= rather than os.chdir, which would move every thread of this process
     result = subprocess.run(
       command,
       shell=True,  # Allow shell commands like pipes and redirects
       capture_output=True,
-      text=True
+      text=True,
+      cwd=env_path_abs
     )
     return (result.stdout, result.stderr)
   except Exception as e:
     # In case of error launching the command itself
     return ("", str(e))
-  finally:
-    # Change back to original directory
-    os.chdir(original_dir)
 
 
 if __name__ == "__main__":
@@ -1,8 +1,12 @@
+import logging
+
 from .actions import ActionsReAct
 from .react import ReAct
 from helpers.models import Run, AgentResult, agent_main
 from helpers.ai import dspy, lm
 
+logger = logging.getLogger(__name__)
+
 class ExecuteExperiment(dspy.Signature):
     """Execute this experiment based on the conditions provided."""
 
@@ -17,7 +21,7 @@ class ExecuteExperiment(dspy.Signature):
 @agent_main
 def main(r: Run) -> AgentResult:
   try:
-    print(f"React agent processing task: {r.task.task}")
+    logger.debug(f"React agent processing task: {r.task.task}")
     problem = r.task.task
     env = r.dir_name
 
@@ -28,11 +32,12 @@ def main(r: Run) -> AgentResult:
       actions.edit_file,
       actions.read_file,
       actions.execute_terminal_command
-    ])
+    ], observation_window=5)
 
     result = react(
       problem=problem
     )
+    # The result (with its trajectory) goes to the run's logs, which the judge reads as evidence
     print(result)
     
     # Use token counts from the result, not from local lm.history
@@ -1,5 +1,7 @@
 import logging
-from typing import Any, Callable, Literal, get_origin
+import functools
+from collections import deque
+from typing import Any, Callable, Literal, NamedTuple, get_origin
 
 from litellm import ContextWindowExceededError
 from pydantic import BaseModel
@@ -12,32 +14,126 @@ import json
 
 logger = logging.getLogger(__name__)
 
+# Mark the system message (instructions and tool descriptions, identical on every iteration) as a
+# provider-side prompt cache breakpoint. Only the trajectory in the user message changes per call.
+PROMPT_CACHE_POINTS = [{"location": "message", "role": "system"}]
+
+class Step(NamedTuple):
+    """One ReAct iteration: the model's thought and tool call, and the resulting observation."""
+    idx: int
+    thought: str
+    tool_name: str
+    tool_args: dict[str, Any]
+    observation: Any
+
+@functools.lru_cache(maxsize=32)
+def _build_signatures(signature, tool_specs, strict_iters):
+    """Build the ReAct and fallback signatures for a signature and its tools.
+
+    `tool_specs` is a tuple of `(name, desc, args)` per tool, so agents constructed with the same
+    signature and tools reuse the instructions and signatures built the first time.
+    """
+    inputs = ", ".join([f"`{k}`" for k in signature.input_fields.keys()])
+    outputs = ", ".join([f"`{k}`" for k in signature.output_fields.keys()])
+    instr = [f"{signature.instructions}\n"] if signature.instructions else []
+    iterations_text = f" after exactly {strict_iters} iterations" if strict_iters is not None else ""
+    pursuit_text = " Unrelentingly pursue the goal and continue to improve with each iteration, making the most of every step. Do not stop. Take diverse exploration and revision paths that are different from your previous paths. Do your best to improve performance on the task with each step, even if it seems complete!" if strict_iters is not None else ""
+    instr.extend([
+        f"You will be given {inputs} and your goal is to finish with {outputs}{iterations_text}.{pursuit_text}\n",
+        "To do this, you will interleave Thought, Tool Name, and Tool Args, and receive a resulting Observation.\n",
+        "Thought can reason about the current situation, and Tool Name can be the following types:\n",
+    ])
+
+    for idx, (name, tool_desc, args) in enumerate(tool_specs):
+        desc = (f", whose description is <desc>{tool_desc}</desc>." if tool_desc else ".").replace("\n", "  ")
+        desc += f" It takes arguments {args} in JSON format."
+        instr.append(f"({idx+1}) {name}{desc}")
+
+    react_signature = (
+        dspy.Signature({**signature.input_fields}, "\n".join(instr))
+        .append("trajectory", dspy.InputField(), type_=str)
+        .append("next_thought", dspy.OutputField(), type_=str)
+        .append("next_tool_name", dspy.OutputField(), type_=Literal[tuple(name for name, _, _ in tool_specs)])
+        .append("next_tool_args", dspy.OutputField(), type_=dict[str, Any])
+    )
+
+    fallback_signature = dspy.Signature(
+        {**signature.input_fields, **signature.output_fields},
+        signature.instructions,
+    ).append("trajectory", dspy.InputField(), type_=str)
+
+    return react_signature, fallback_signature
+
+@functools.lru_cache(maxsize=None)
+def _step_keys(idx):
+    """Trajectory keys for step `idx`, formatted once per index instead of on every trajectory rebuild."""
+    return f"thought_{idx}", f"tool_name_{idx}", f"tool_args_{idx}", f"observation_{idx}"
+
+@functools.lru_cache(maxsize=256)
+def _trajectory_signature(keys):
+    """Signature used to format a trajectory with the given keys. Keys grow by one step per iteration, so
+    nearly every lookup after the first run is a hit."""
+    return dspy.Signature(f"{', '.join(keys)} -> x")
+
+def _json_key(key):
+    """Dict keys as `json.dumps` would write them."""
+    if isinstance(key, str):
+        return key
+    if isinstance(key, (bool, float)) or key is None:
+        return json.dumps(key)
+    if isinstance(key, int):
+        return str(int(key))
+    return str(key)
+
+def _sanitize(obj):
+    """Make `obj` JSON-compatible in a single pass, with the same result as
+    `json.loads(json.dumps(obj, default=str))` but without producing the intermediate text."""
+    if obj is None or type(obj) in (str, bool, int, float):
+        return obj
+    # Subclasses (str/int enums, etc.) are written as their plain value
+    for base in (str, int, float):
+        if isinstance(obj, base):
+            return base(obj)
+    if isinstance(obj, dict):
+        return {_json_key(k): _sanitize(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_sanitize(v) for v in obj]
+    return str(obj)
+
 class ReAct(Module):
-    def __init__(self, signature, tools: list[Callable], max_iters=100, strict_iters: int | None = None):
+    def __init__(
+        self,
+        signature,
+        tools: list[Callable],
+        max_iters=100,
+        strict_iters: int | None = None,
+        observation_window: int | None = None,
+    ):
         """
         `tools` is either a list of functions, callable classes, or `dspy.Tool` instances.
         `strict_iters` enforces a fixed number of iterations, overriding `max_iters`.
+        `observation_window` keeps only the latest N observations verbatim in the prompt. Older ones are
+        replaced by a short stub and can be fetched again with the `seek_information` tool.
         """
 
         self.signature = signature = ensure_signature(signature)
         self.max_iters = max_iters
         self.strict_iters = strict_iters
+        self.observation_window = observation_window
+        self._observations = {}
 
         tools = [t if isinstance(t, Tool) else Tool(t) for t in tools]
         tools = {tool.name: tool for tool in tools}
 
-        inputs = ", ".join([f"`{k}`" for k in signature.input_fields.keys()])
-        outputs = ", ".join([f"`{k}`" for k in signature.output_fields.keys()])
-        instr = [f"{signature.instructions}\n"] if signature.instructions else []
-        iterations_text = f" after exactly {self.strict_iters} iterations" if self.strict_iters is not None else ""
-        pursuit_text = " Unrelentingly pursue the goal and continue to improve with each iteration, making the most of every step. Do not stop. Take diverse exploration and revision paths that are different from your previous paths. Do your best to improve performance on the task with each step, even if it seems complete!" if self.strict_iters is not None else ""
-        instr.extend([
-            f"You will be given {inputs} and your goal is to finish with {outputs}{iterations_text}.{pursuit_text}\n",
-            "To do this, you will interleave Thought, Tool Name, and Tool Args, and receive a resulting Observation.\n",
-            "Thought can reason about the current situation, and Tool Name can be the following types:\n",
-        ])
+        if self.observation_window is not None:
+            tools["seek_information"] = Tool(
+                self.seek_information,
+                name="seek_information",
+                desc="Returns the full observation of an earlier step whose observation was elided from the trajectory. `step_id` is the N in `observation_N`.",
+            )
 
         if self.strict_iters is None:
+            outputs = ", ".join([f"`{k}`" for k in signature.output_fields.keys()])
             tools["finish"] = Tool(
                 func=lambda **kwargs: "Completed.",
                 name="finish",
@@ -45,44 +141,56 @@ class ReAct(Module):
                 args={},
             )
 
-        for idx, tool in enumerate(tools.values()):
-            args = getattr(tool, "args")
-            desc = (f", whose description is <desc>{tool.desc}</desc>." if tool.desc else ".").replace("\n", "  ")
-            desc += f" It takes arguments {args} in JSON format."
-            instr.append(f"({idx+1}) {tool.name}{desc}")
-
-        react_signature = (
-            dspy.Signature({**signature.input_fields}, "\n".join(instr))
-            .append("trajectory", dspy.InputField(), type_=str)
-            .append("next_thought", dspy.OutputField(), type_=str)
-            .append("next_tool_name", dspy.OutputField(), type_=Literal[tuple(tools.keys())])
-            .append("next_tool_args", dspy.OutputField(), type_=dict[str, Any])
-        )
-
-        fallback_signature = dspy.Signature(
-            {**signature.input_fields, **signature.output_fields},
-            signature.instructions,
-        ).append("trajectory", dspy.InputField(), type_=str)
+        tool_specs = tuple((tool.name, tool.desc, str(getattr(tool, "args"))) for tool in tools.values())
+        react_signature, fallback_signature = _build_signatures(signature, tool_specs, self.strict_iters)
 
         self.tools = tools
-        self.react = dspy.Predict(react_signature)
+        self.react = dspy.Predict(react_signature, cache_control_injection_points=PROMPT_CACHE_POINTS)
         self.extract = dspy.ChainOfThought(fallback_signature)
+        self._adapter = dspy.settings.adapter or dspy.ChatAdapter()
 
-    def _format_trajectory(self, trajectory: dict[str, Any]):
-        adapter = dspy.settings.adapter or dspy.ChatAdapter()
-        trajectory_signature = dspy.Signature(f"{', '.join(trajectory.keys())} -> x")
-        return adapter.format_user_message_content(trajectory_signature, trajectory)
+    def seek_information(self, step_id: int) -> Any:
+        """Return the full observation recorded for `step_id`."""
+        if step_id not in self._observations:
+            return f"No observation recorded for step {step_id}."
+        return self._observations[step_id]
+
+    def _trajectory_dict(self, steps: deque[Step], compact: bool = False) -> dict[str, Any]:
+        """Expand `steps` into numbered trajectory keys.
+
+        With `compact`, observations older than `observation_window` steps are replaced by a stub pointing
+        at `seek_information`.
+        """
+        oldest_kept = None
+        if compact and self.observation_window is not None and steps:
+            oldest_kept = steps[-1].idx - self.observation_window + 1
 
-    def forward(self, **input_args):
         trajectory = {}
+        for step in steps:
+            observation = step.observation
+            if oldest_kept is not None and step.idx < oldest_kept:
+                observation = f"[{len(str(observation))} characters elided, call seek_information with step_id={step.idx} to view]"
+            thought_key, tool_name_key, tool_args_key, observation_key = _step_keys(step.idx)
+            trajectory[thought_key] = step.thought
+            trajectory[tool_name_key] = step.tool_name
+            trajectory[tool_args_key] = step.tool_args
+            trajectory[observation_key] = observation
+        return trajectory
+
+    def _format_trajectory(self, steps: deque[Step]):
+        trajectory = self._trajectory_dict(steps, compact=True)
+        trajectory_signature = _trajectory_signature(tuple(trajectory))
+        return self._adapter.format_user_message_content(trajectory_signature, trajectory)
+
+    def forward(self, **input_args):
+        steps = deque()
         num_iters = self.strict_iters if self.strict_iters is not None else self.max_iters
+        usage_mark = lm.history.usage()
+        self._observations = {}
 
         for idx in range(num_iters):
-            pred = self._call_with_potential_trajectory_truncation(self.react, trajectory, **input_args)
-
-            trajectory[f"thought_{idx}"] = pred.next_thought
-            trajectory[f"tool_name_{idx}"] = pred.next_tool_name
-            trajectory[f"tool_args_{idx}"] = pred.next_tool_args
+            iteration_mark = lm.history.appended
+            pred = self._call_with_potential_trajectory_truncation(self.react, steps, **input_args)
 
             try:
                 parsed_tool_args = {}
@@ -96,36 +204,38 @@ class ReAct(Module):
                             parsed_tool_args[k] = arg_type.model_validate(v)
                             continue
                     parsed_tool_args[k] = v
-                trajectory[f"observation_{idx}"] = self.tools[pred.next_tool_name](**parsed_tool_args)
+                observation = self.tools[pred.next_tool_name](**parsed_tool_args)
             except Exception as e:
-                trajectory[f"observation_{idx}"] = f"Failed to execute: {e}"
+                observation = f"Failed to execute: {e}"
                 logger.error(f"Failed to execute: {e}")
+            steps.append(Step(idx, pred.next_thought, pred.next_tool_name, pred.next_tool_args, observation))
+            self._observations[idx] = observation
+
+            if logger.isEnabledFor(logging.DEBUG):
+                # Latest LM call of this run (other tasks may be calling the LM concurrently)
+                iteration_calls = lm.history.since(iteration_mark)
+                usage = iteration_calls[-1].get('usage', {}) if iteration_calls else {}
+                logger.debug(f"<ITERATION #{idx} DETAILS>\n")
+                logger.debug(f"<TOKENS>")
+                logger.debug(f"Input Tokens: {usage.get('prompt_tokens', None)}")
+                logger.debug(f"Output Tokens: {usage.get('completion_tokens', None)}")
+                logger.debug(f"Total Tokens: {usage.get('total_tokens', None)}")
+                logger.debug(f"</TOKENS>")
+                logger.debug(f"<HISTORY>")
+                dspy.inspect_history(n=1)
+                logger.debug(f"</HISTORY>")
+                logger.debug(f"</ITERATION #{idx} DETAILS>")
 
-            # print(f"Language Model: {lm}")
-            print(f"LM History: {lm.history[-1].get('usage', None)}")
-            logger.info(f"<ITERATION #{idx} DETAILS>\n")
-            logger.info(f"<TOKENS>")
-            logger.info(f"Input Tokens: {lm.history[-1].get('usage', {}).get('prompt_tokens', None)}")
-            logger.info(f"Output Tokens: {lm.history[-1].get('usage', {}).get('completion_tokens', None)}")
-            logger.info(f"Total Tokens: {lm.history[-1].get('usage', {}).get('total_tokens', None)}")
-            logger.info(f"</TOKENS>")
-            logger.info(f"<HISTORY>")
-            dspy.inspect_history(n=1)
-            logger.info(f"</HISTORY>")
-            logger.info(f"</ITERATION #{idx} DETAILS>")
-                
             if self.strict_iters is None and pred.next_tool_name == "finish":
                 break
 
-        # Print full LM history with all nested levels
-        history_str = str(lm.history)
-        logger.info(f"Full LM History:\n{history_str}")
-        
-        extract = self._call_with_potential_trajectory_truncation(self.extract, trajectory, **input_args)
-        
-        pred = dspy.Prediction(trajectory=trajectory, **extract)
-        input_tokens = sum([x.get('usage', {}).get('prompt_tokens', 0) for x in lm.history])
-        output_tokens = sum([x.get('usage', {}).get('completion_tokens', 0) for x in lm.history])
+        extract = self._call_with_potential_trajectory_truncation(self.extract, steps, **input_args)
+
+        pred = dspy.Prediction(trajectory=self._trajectory_dict(steps), **extract)
+        # Only count the LM calls made during this run (including any made by tools)
+        run_usage = lm.history.usage_since(usage_mark)
+        input_tokens = run_usage['prompt_tokens']
+        output_tokens = run_usage['completion_tokens']
         result = {
           'input_tokens': input_tokens,
           'output_tokens': output_tokens,
@@ -138,33 +248,31 @@ class ReAct(Module):
         for k, v in extract.items():
             result[k] = v
 
-        return json.loads(json.dumps(result, default=str))
-    def _call_with_potential_trajectory_truncation(self, module, trajectory, **input_args):
+        return _sanitize(result)
+
+    def _call_with_potential_trajectory_truncation(self, module, steps, **input_args):
         while True:
             try:
                 return module(
                     **input_args,
-                    trajectory=self._format_trajectory(trajectory),
+                    trajectory=self._format_trajectory(steps),
                 )
             except ContextWindowExceededError:
                 logger.warning("Trajectory exceeded the context window, truncating the oldest tool call information.")
-                trajectory = self.truncate_trajectory(trajectory)
+                steps = self.truncate_trajectory(steps)
 
-    def truncate_trajectory(self, trajectory):
+    def truncate_trajectory(self, steps):
         """Truncates the trajectory so that it fits in the context window.
 
-        Users can override this method to implement their own truncation logic.
+        `steps` is the deque of `Step`s taken so far. Users can override this method to implement their own
+        truncation logic.
         """
-        keys = list(trajectory.keys())
-        if len(keys) < 4:
-            # Every tool call has 4 keys: thought, tool_name, tool_args, and observation.
+        if not steps:
             raise ValueError(
                 "The trajectory is too long so your prompt exceeded the context window, but the trajectory cannot be "
                 "truncated because it only has one tool call."
             )
 
-        for key in keys[:4]:
-            trajectory.pop(key)
-
-        return trajectory
+        steps.popleft()
+        return steps
 
@@ -1,3 +1,5 @@
+import logging
+
 from mcp import ClientSession, StdioServerParameters
 from mcp.client.stdio import stdio_client
 
@@ -7,6 +9,8 @@ from .react import ReAct
 from .actions import Actions
 from pathlib import Path
 
+logger = logging.getLogger(__name__)
+
 class ReactAgent:
   
     def __init__(self, dir_name):
@@ -54,34 +58,35 @@ class ReactAgent:
         dspy_tools = [actions.run_terminal_command]
 
         # Initialize filesystem server and tools
-        print("Initializing filesystem tools...")
+        logger.debug("Initializing filesystem tools...")
         async with stdio_client(SERVER_PARAMS_FS) as (read_0, write_0):
             async with ClientSession(read_0, write_0) as session_0:
                 await session_0.initialize()
                 tools_0 = await session_0.list_tools()
                 for tool in tools_0.tools:
                     dspy_tools.append(dspy.Tool.from_mcp_tool(session_0, tool))
-                print(f"  Loaded {len(tools_0.tools)} filesystem tools.")
+                logger.debug(f"Loaded {len(tools_0.tools)} filesystem tools.")
 
                 # Initialize memory server and tools
-                print("Initializing memory tools...")
+                logger.debug("Initializing memory tools...")
                 async with stdio_client(SERVER_PARAMS_MEM) as (read_1, write_1):
                     async with ClientSession(read_1, write_1) as session_1:
                         await session_1.initialize()
                         tools_1 = await session_1.list_tools()
                         for tool in tools_1.tools:
                             dspy_tools.append(dspy.Tool.from_mcp_tool(session_1, tool))
-                        print(f"  Loaded {len(tools_1.tools)} memory tools.")
+                        logger.debug(f"Loaded {len(tools_1.tools)} memory tools.")
 
-                        print(f"\nTotal tools available: {len(dspy_tools)}")
+                        logger.debug(f"Total tools available: {len(dspy_tools)}")
 
                         # Configure and run the ReAct agent
-                        print("\nConfiguring ReAct agent...")
+                        logger.debug("Configuring ReAct agent...")
                         react = ReAct(ExecuteExperiment, tools=dspy_tools)
 
-                        print("Running ReAct agent...")
+                        logger.debug("Running ReAct agent...")
                         result = await react.acall(task=task)
 
+                        # The result (with its trajectory) goes to the run's logs, which the judge reads as evidence
                         print("\n--- Agent Result ---")
                         print(result)
                         print("--- End Agent Result ---")
@@ -90,16 +95,19 @@ class ReactAgent:
 @agent_main
 async def main(r: Run):
   try:
-    print(f"React MCP agent processing task: {r.task.task}")
+    logger.debug(f"React MCP agent processing task: {r.task.task}")
     task = r.task.task
     dir_name = Path(r.dir_name).resolve()
     
     agent = ReactAgent(dir_name=dir_name)
+    usage_mark = lm.history.usage()
     result = await agent.run(task=task)
     
-    input_tokens = sum([x.get('usage', {}).get('prompt_tokens', 0) for x in lm.history])
-    output_tokens = sum([x.get('usage', {}).get('completion_tokens', 0) for x in lm.history])
-    cost = sum([x.get('cost', 0) for x in lm.history])
+    # Only count the LM calls made for this task
+    task_usage = lm.history.usage_since(usage_mark)
+    input_tokens = task_usage['prompt_tokens']
+    output_tokens = task_usage['completion_tokens']
+    cost = task_usage['cost']
     
     return AgentResult(
       completed=result['completed'], 
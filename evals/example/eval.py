@@ -1,44 +1,85 @@
 from helpers.models import Run, EvalResult, eval_function
-import subprocess
-import re
+import sys
+import threading
 from pathlib import Path
 
+import pytest
+
+# pytest keeps global state (sys.modules, sys.path, plugin manager), so in-process runs must not overlap
+_pytest_lock = threading.Lock()
+
+class _OutcomeCounter:
+    """pytest plugin that tallies test outcomes as they are reported"""
+    def __init__(self):
+        self.passed = 0
+        self.failed = 0
+        self.skipped = 0
+
+    def pytest_runtest_logreport(self, report):
+        if report.when == "call":
+            if report.passed:
+                self.passed += 1
+            elif report.failed:
+                self.failed += 1
+            else:
+                self.skipped += 1
+        elif report.when == "setup" and report.skipped:
+            self.skipped += 1
+
+def _is_under(module, root: Path) -> bool:
+    module_file = getattr(module, "__file__", None)
+    return module_file is not None and Path(module_file).resolve().is_relative_to(root)
+
+def _run_pytest(test_file: Path) -> _OutcomeCounter:
+    """Run `test_file` with pytest in this process, leaving sys.modules and sys.path as they were"""
+    counter = _OutcomeCounter()
+    env_root = test_file.parent.resolve()
+    with _pytest_lock:
+        saved_path = list(sys.path)
+        try:
+            pytest.main(
+                # -s keeps pytest from capturing the host's stdout/stderr, and without the terminal reporter nothing
+                # is printed into the run's logs (where the LLM judge would read it). No cache dir is written into
+                # the env either
+                [
+                    "-s", "-p", "no:terminal", "-p", "no:cacheprovider",
+                    "--rootdir", str(env_root), str(test_file),
+                ],
+                plugins=[counter],
+            )
+        finally:
+            # Drop the env's modules so the next evaluation imports its own copy. Modules imported meanwhile by
+            # other threads (agents, the judge) live outside the env and stay loaded
+            for name, module in list(sys.modules.items()):
+                if _is_under(module, env_root):
+                    del sys.modules[name]
+            sys.path[:] = saved_path
+    return counter
+
 @eval_function
 def eval_markdown(r: Run) -> EvalResult:
     """Evaluate the markdown task by running the tests"""
-    
-    env_path = Path(r.dir_name)
+
+    env_path = Path(r.dir_name).resolve()
     eval_dir = Path(__file__).parent
-    
+
     # Check that the unit tests weren't modified
     test_file_original_contents = (eval_dir / "solution" / "tests.py").read_text()
     test_file_environment_contents = (env_path / "tests.py").read_text()
     if test_file_environment_contents != test_file_original_contents:
         return EvalResult(passed=False, result="Agent modified the unit tests!")
-    
+
     # Run unit tests
-    result = subprocess.run(
-        ["pytest", "-q", "--tb=no", "tests.py"],
-        cwd=str(env_path),
-        capture_output=True,
-        text=True,
-        check=False,
-    )
-    
-    # Find how many passed
-    results = re.search(
-        r"(?:(\d+)\s+failed,?\s*)?(?:(\d+)\s+passed,?\s*)?(?:(\d+)\s+skipped)?",
-        result.stdout.strip().split("\n")[-1],
-    )
-    
+    results = _run_pytest(env_path / "tests.py")
+
     # Count the results
-    failed = int(results.group(1) or 0)
-    passed = int(results.group(2) or 0)
-    skipped = int(results.group(3) or 0)
+    failed = results.failed
+    passed = results.passed
+    skipped = results.skipped
     total = failed + passed + skipped
-    
+
     # Score
     score = float(total > 0 and (passed / total))
     details = f"Failed: {failed}, Passed: {passed}, Skipped: {skipped}, Total: {total}, Score: {score:.2f}"
-    
-    return EvalResult(passed=score > 0.8, result=details)
\ No newline at end of file
+
+    return EvalResult(passed=score > 0.8, result=details)
@@ -1,17 +1,22 @@
 import re
 
+_BOLD = re.compile(r"\*\*(.*?)\*\*")
+_ITALIC = re.compile(r"\*(.*?)\*")
+_H2 = re.compile(r"^## (.*)\n", re.MULTILINE)
+_H1 = re.compile(r"^# (.*)\n", re.MULTILINE)
+
 
 def convert(content):
     html = content
 
     # Replace markdown bold tags with HTML bold tags
-    html = re.sub(r"\*\*(.*?)\*\*", r"<b>\1</b>", html)
+    html = _BOLD.sub(r"<b>\1</b>", html)
 
     # Replace markdown italic tags with HTML italic tags
-    html = re.sub(r"\*(.*?)\*", r"<i>\1</i>", html)
+    html = _ITALIC.sub(r"<i>\1</i>", html)
 
-    # Replace markdown header tags with HTML header tags
-    html = re.sub(r"^## (.*)\n", r"<h2>\1</h2>\n", html)
-    html = re.sub(r"^# (.*)\n", r"<h1>\1</h1>\n", html)
+    # Replace markdown header tags with HTML header tags, on any line of the document
+    html = _H2.sub(r"<h2>\1</h2>\n", html)
+    html = _H1.sub(r"<h1>\1</h1>\n", html)
 
     return html
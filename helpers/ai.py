@@ -1,12 +1,75 @@
 import os
+import threading
 import dspy
+from contextvars import ContextVar
 from typing import Optional
 from pydantic import BaseModel
 from dotenv import load_dotenv
 
 load_dotenv()
 
+class HistoryScope:
+    """The unit of work (e.g. one task) that LM calls made in the current context belong to.
+
+    Keeps running usage totals of those calls as they are appended, so they stay exact however many entries
+    the bounded history has trimmed since.
+    """
+    def __init__(self):
+        self.usage = {"prompt_tokens": 0, "completion_tokens": 0, "cost": 0.0}
+
+# Tasks running concurrently each set their own scope, so `BoundedHistory.since` and `usage` only cover their own
+# calls. Calls made outside any task share the default scope.
+history_scope: ContextVar[HistoryScope] = ContextVar("history_scope", default=HistoryScope())
+
+class BoundedHistory(list):
+    """LM call history that keeps only the most recent `maxlen` entries.
+
+    Trims in batches so appends stay amortized O(1). `appended` counts every entry ever added, so callers can
+    take a mark before some work and read back just the calls made since with `since(mark)`.
+    Entries are tagged with the `history_scope` they were made in, and their usage is added to that scope's totals;
+    use `usage` / `usage_since` for token counts, since `since` only sees entries that haven't been trimmed yet.
+    Concurrent agents share one history, so appends, trimming and reads hold a lock.
+    """
+    def __init__(self, maxlen: int):
+        super().__init__()
+        self.maxlen = maxlen
+        self.appended = 0
+        self._lock = threading.Lock()
+
+    def append(self, entry):
+        scope = entry["scope"] = history_scope.get()
+        usage = entry.get("usage") or {}
+        with self._lock:
+            scope.usage["prompt_tokens"] += usage.get("prompt_tokens") or 0
+            scope.usage["completion_tokens"] += usage.get("completion_tokens") or 0
+            scope.usage["cost"] += entry.get("cost") or 0
+            super().append(entry)
+            self.appended += 1
+            if len(self) > 2 * self.maxlen:
+                del self[:-self.maxlen]
+
+    def since(self, mark: int) -> list:
+        """Entries appended after `mark` (an earlier value of `appended`) in the current scope that are still retained."""
+        scope = history_scope.get()
+        with self._lock:
+            count = min(self.appended - mark, len(self))
+            if count <= 0:
+                return []
+            recent = self[len(self) - count:]
+        return [entry for entry in recent if entry.get("scope") is scope]
+
+    def usage(self) -> dict:
+        """Usage totals of every LM call made so far in the current scope"""
+        scope = history_scope.get()
+        with self._lock:
+            return dict(scope.usage)
+
+    def usage_since(self, mark: dict) -> dict:
+        """Usage of the LM calls made in the current scope since `mark` (an earlier result of `usage()`)"""
+        return {key: total - mark[key] for key, total in self.usage().items()}
+
 lm = dspy.LM("openai/gpt-4o", api_key=os.getenv('OPENAI_API_KEY'), temperature=0)
+lm.history = BoundedHistory(maxlen=1000)
 dspy.configure(lm=lm)
  
 def ai(user_prompt: str, system_prompt: Optional[str] = None):
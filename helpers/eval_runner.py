@@ -0,0 +1,66 @@
+"""Loads task-specific eval.py files, in this process or in a child process of their own.
+
+Run as `python -m helpers.eval_runner <eval.py>` with a Run as JSON on stdin; the EvalResult is written to stdout
+as JSON (`null` if the file has no evaluation function).
+"""
+import os
+import sys
+import asyncio
+import importlib.util
+
+from helpers.models import Run, EvalResult
+
+def load_eval_function(module_name, path):
+    """Import an eval.py and return its evaluation function, or None if it has none"""
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    eval_module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(eval_module)
+
+    # Functions decorated with @eval_function, whether defined in the eval.py or imported into it
+    for attr_name in dir(eval_module):
+        attr = getattr(eval_module, attr_name)
+        if callable(attr) and getattr(attr, "_is_eval_function", False):
+            return attr
+
+    # Otherwise fall back to a plain module-level `evaluate`
+    eval_function = getattr(eval_module, "evaluate", None)
+    return eval_function if callable(eval_function) else None
+
+async def run_isolated(path, run: Run):
+    """Run the eval.py at `path` on `run` in a fresh interpreter and return its EvalResult (None if it has no
+    evaluation function). The eval's imports and global state never touch this process.
+
+    The child gets its own session, so signals meant for the runner (e.g. Ctrl-C) don't reach it half way
+    through; its output other than the result goes to this process's stderr.
+    """
+    process = await asyncio.create_subprocess_exec(
+        sys.executable, "-m", "helpers.eval_runner", str(path),
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+        start_new_session=True,
+    )
+    stdout, _ = await process.communicate(Run.__pydantic_serializer__.to_json(run))
+    if process.returncode != 0:
+        raise RuntimeError(f"Evaluation process for {path} exited with code {process.returncode}")
+    if stdout.strip() == b"null":
+        return None
+    return EvalResult.model_validate_json(stdout)
+
+def main():
+    path = sys.argv[1]
+    run = Run.model_validate_json(sys.stdin.buffer.read())
+
+    # Anything the eval prints goes to stderr; stdout only carries the result
+    result_fd = os.dup(1)
+    os.dup2(2, 1)
+    sys.stdout = sys.stderr
+
+    eval_function = load_eval_function("eval_isolated", path)
+    result = eval_function(run) if eval_function else None
+
+    sys.stderr.flush()
+    with os.fdopen(result_fd, "wb") as out:
+        out.write(b"null" if result is None else EvalResult.__pydantic_serializer__.to_json(result))
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,12 @@
+import io
+import os
 import json
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
 
 from helpers.ai import dspy
+from helpers.logger import flush_logs
 from helpers.models import Task, EvalResult
 
 class TaskEvaluator(dspy.Signature):
@@ -18,79 +23,166 @@ class TaskEvaluator(dspy.Signature):
 
 predictor = dspy.ChainOfThought(TaskEvaluator)
 
-def evaluate_task(task: Task, run_dir: str) -> EvalResult:
-    """
-    Evaluate whether a task was completed successfully by examining logs, outputs, and summary.
-    
-    Args:
-        task: The Task object containing the task description and success criteria
-        run_dir: Directory containing task execution logs and outputs
-    
-    Returns:
-        EvalResult indicating success/failure with detailed explanation
-    """
-    run_path = Path(run_dir)
-    
-    # Gather execution logs
-    execution_logs = ""
-    
-    # Read stdout logs
-    stdout_path = run_path / "out.log"
-    if stdout_path.exists():
-        with open(stdout_path) as f:
-            content = f.read().strip()
-            if content:
-                execution_logs += f"<STDOUT>\n{content}\n</STDOUT>\n\n"
-    
-    # Read stderr logs  
-    stderr_path = run_path / "err.log"
-    if stderr_path.exists():
-        with open(stderr_path) as f:
-            content = f.read().strip()
-            if content:
-                execution_logs += f"<STDERR>\n{content}\n</STDERR>\n\n"
-    
-    # Read info logs
-    info_path = run_path / "info.log"
-    if info_path.exists():
-        with open(info_path) as f:
-            content = f.read().strip()
-            if content:
-                execution_logs += f"<INFO_LOG>\n{content}\n</INFO_LOG>\n\n"
-    
-    # Read error logs
-    error_path = run_path / "error.log"
-    if error_path.exists():
-        with open(error_path) as f:
-            content = f.read().strip()
+# Runs judge LM calls for `start_evaluation`
+_judge_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="llm-judge")
+
+# Log files in the run directory and the tag each is wrapped in, in the order they're shown to the judge
+LOG_FILES = {
+    "out.log": "STDOUT",
+    "err.log": "STDERR",
+    "info.log": "INFO_LOG",
+    "error.log": "ERROR_LOG",
+}
+
+# Summaries larger than this (after compaction) are left out of the judge prompt
+MAX_SUMMARY_CHARS = 32 * 1024
+
+# Per-task logs of a run, one JSON object per line, next to summary.json
+TASK_LOGS_FILE = "task_logs.jsonl"
+
+NO_EXECUTION_LOGS = "No execution logs found."
+NO_SUMMARY = "No summary file found."
+
+@dataclass(frozen=True)
+class _Verdict:
+    passed: bool
+    reasoning: str
+    details: str
+
+def _judge(task: str, success_criteria: str, execution_logs: str, summary_info: str) -> _Verdict:
+    """Ask the judge LM for a verdict. Identical prompts are answered from dspy's LM cache."""
+    result = predictor(
+        task=task,
+        success_criteria=success_criteria,
+        execution_logs=execution_logs,
+        summary_info=summary_info
+    )
+    return _Verdict(passed=result.passed, reasoning=result.reasoning, details=result.details)
+
+def _format_summary(summary_data) -> str:
+    """Reduce a run summary to the fields the judge needs, instead of embedding the whole file in the prompt."""
+    if not isinstance(summary_data, dict):
+        return f"<SUMMARY>\n{json.dumps(summary_data, indent=2)}\n</SUMMARY>"
+
+    task_logs = summary_data.get("task_logs") or []
+    compact_summary = {
+        "total_score": summary_data.get("total_score"),
+        "total_time": summary_data.get("total_time"),
+        "task_logs": [
+            {
+                "task_id": log.get("task_id"),
+                "completed": (log.get("result") or {}).get("completed"),
+                "passed": (log.get("evaluation") or {}).get("passed"),
+            }
+            for log in task_logs
+        ],
+    }
+    text = json.dumps(compact_summary, indent=2)
+    if len(text) > MAX_SUMMARY_CHARS:
+        return f"<summary truncated: {len(task_logs)} tasks>"
+    return f"<SUMMARY>\n{text}\n</SUMMARY>"
+
+def _gather_logs(run_path: Path) -> str:
+    """Read the non-empty log files of a run concurrently and wrap each in its tag."""
+    try:
+        with os.scandir(run_path) as it:
+            entries = {e.name: e.path for e in it if e.name in LOG_FILES and e.is_file() and e.stat().st_size > 0}
+    except FileNotFoundError:
+        return ""
+    if not entries:
+        return ""
+
+    with ThreadPoolExecutor(max_workers=len(entries)) as pool:
+        contents = {name: pool.submit(Path(path).read_text) for name, path in entries.items()}
+
+    logs = io.StringIO()
+    for name, tag in LOG_FILES.items():
+        if name in contents:
+            content = contents[name].result().strip()
             if content:
-                execution_logs += f"<ERROR_LOG>\n{content}\n</ERROR_LOG>\n\n"
+                logs.write(f"<{tag}>\n{content}\n</{tag}>\n\n")
+    return logs.getvalue()
+
+def _read_task_logs(path: Path) -> list:
+    """Task logs from a JSON Lines file, skipping lines that can't be parsed (e.g. cut off by a crash)"""
+    task_logs = []
+    try:
+        with open(path, "rb") as f:
+            for line in f:
+                try:
+                    task_logs.append(json.loads(line))
+                except ValueError:
+                    continue
+    except FileNotFoundError:
+        pass
+    return task_logs
+
+def _collect_evidence(run_path: Path) -> tuple[str, str]:
+    """Read the run's logs and summary as the judge will see them"""
+    # Log files are written by a background listener; wait until everything logged so far is in them
+    flush_logs()
+
+    # Gather execution logs
+    execution_logs = _gather_logs(run_path)
     
     if not execution_logs:
-        execution_logs = "No execution logs found."
+        execution_logs = NO_EXECUTION_LOGS
     
     # Gather summary information
     summary_info = ""
     summary_path = run_path / "summary.json"
-    if summary_path.exists():
-        try:
-            with open(summary_path) as f:
-                summary_data = json.load(f)
-                summary_info = f"<SUMMARY>\n{json.dumps(summary_data, indent=2)}\n</SUMMARY>"
-        except (json.JSONDecodeError, FileNotFoundError):
-            summary_info = "Summary file exists but could not be parsed."
-    else:
-        summary_info = "No summary file found."
+    try:
+        with open(summary_path) as f:
+            summary_data = json.load(f)
+        # Per-task logs are kept next to the summary rather than in it
+        if isinstance(summary_data, dict) and "task_logs" not in summary_data:
+            summary_data["task_logs"] = _read_task_logs(run_path / TASK_LOGS_FILE)
+        summary_info = _format_summary(summary_data)
+    except FileNotFoundError:
+        summary_info = NO_SUMMARY
+    except json.JSONDecodeError:
+        summary_info = "Summary file exists but could not be parsed."
+
+    return execution_logs, summary_info
+
+def _evaluate(task: Task, execution_logs: str, summary_info: str) -> EvalResult:
+    # Nothing for the judge to look at
+    if execution_logs == NO_EXECUTION_LOGS and summary_info == NO_SUMMARY:
+        return EvalResult(passed=False, result="No evidence to evaluate")
     
     # Run the evaluation
-    result = predictor(
-        task=task.task,
-        success_criteria=task.success_criteria if task.success_criteria else "Task is fulfilled",
-        execution_logs=execution_logs,
-        summary_info=summary_info
+    result = _judge(
+        task.task,
+        task.success_criteria if task.success_criteria else "Task is fulfilled",
+        execution_logs,
+        summary_info
     )
     
     return EvalResult(
         passed=result.passed,
         result=f"Reasoning:\n{result.reasoning}\n\nDetails:\n{result.details}"
     )
+
+def evaluate_task(task: Task, run_dir: str) -> EvalResult:
+    """
+    Evaluate whether a task was completed successfully by examining logs, outputs, and summary.
+    
+    Args:
+        task: The Task object containing the task description and success criteria
+        run_dir: Directory containing task execution logs and outputs
+    
+    Returns:
+        EvalResult indicating success/failure with detailed explanation
+    """
+    return _evaluate(task, *_collect_evidence(Path(run_dir)))
+
+def start_evaluation(task: Task, run_dir: str) -> Future:
+    """
+    Like `evaluate_task`, but only the evidence is gathered before returning; the judge LM call runs in the
+    background so the caller can do other work meanwhile.
+    
+    Returns:
+        Future resolving to the EvalResult
+    """
+    evidence = _collect_evidence(Path(run_dir))
+    return _judge_executor.submit(_evaluate, task, *evidence)
@@ -1,36 +1,100 @@
+import io
+import atexit
 import logging
+import logging.handlers
+import queue
 import sys
 import os
+import threading
 from pathlib import Path
 
 class PrintToLogger:
-    """Redirects stdout/stderr to logging while preserving original streams"""
+    """Redirects stdout/stderr to logging while preserving original streams.
+
+    Writes are buffered per thread and emitted a batch of complete lines at a time (or on `flush()`),
+    so a burst of prints costs one log record and one write to the original stream. A partial line left by a
+    thread that has exited is emitted by `flush_threads` (via `flush_logs`, and at exit). Captured stdout is
+    only written back to the original stream when that is a terminal; otherwise it already reaches all.log
+    and the console through logging.
+    """
     def __init__(self, is_stderr=False):
-        self._stdout = sys.stdout
-        self._stderr = sys.stderr
-        self._is_stderr = is_stderr
-        self._buffer = []
+        self._stream = sys.stderr if is_stderr else sys.stdout
+        self._logger = logging.getLogger("stderr" if is_stderr else "stdout")
+        self._log_method = self._logger.error if is_stderr else self._logger.info
+        self._local = threading.local()
+        # Every thread's buffer, so what a thread printed without a final newline isn't lost when it exits
+        self._buffers = {}
+        self._buffers_lock = threading.Lock()
         # Store the original fileno
-        self._fileno = self._stderr.fileno() if is_stderr else self._stdout.fileno()
-        
-    def write(self, text):
+        self._fileno = self._stream.fileno()
+        # stderr is kept off the console handler, so it is always written back
+        self._passthrough = is_stderr or self._stream.isatty()
+
+    def _buffer(self):
+        buf = getattr(self._local, "buf", None)
+        if buf is None:
+            buf = self._local.buf = io.StringIO()
+            with self._buffers_lock:
+                self._buffers[threading.current_thread()] = buf
+        return buf
+
+    def _drain(self, buf, keep=""):
+        buf.seek(0)
+        buf.truncate()
+        buf.write(keep)
+
+    def _emit(self, text):
         if text.strip():
-            if self._is_stderr:
-                logging.getLogger("stderr").error(text.rstrip())
-            else:
-                logging.getLogger("stdout").info(text.rstrip())
-        
+            self._log_method(text.rstrip())
         # Also write to original stdout/stderr
-        if self._is_stderr:
-            self._stderr.write(text)
-        else:
-            self._stdout.write(text)
+        if self._passthrough:
+            self._stream.write(text)
+
+    def write(self, text):
+        buf = self._buffer()
+        if text == "\n":
+            # print()'s line terminator: whatever is buffered is now exactly one complete line
+            pending = buf.getvalue()
+            if not pending:
+                if self._passthrough:
+                    self._stream.write(text)
+                return 1
+            self._drain(buf)
+            self._emit(pending + text)
+            return 1
+        buf.write(text)
+        if "\n" in text:
+            # Emit every complete line and keep the trailing partial one buffered
+            complete, newline, partial = buf.getvalue().rpartition("\n")
+            self._drain(buf, partial)
+            self._emit(complete + newline)
+        return len(text)
         
     def flush(self):
-        if self._is_stderr:
-            self._stderr.flush()
-        else:
-            self._stdout.flush()
+        buf = self._buffer()
+        pending = buf.getvalue()
+        if pending:
+            self._drain(buf)
+            self._emit(pending)
+        self._stream.flush()
+
+    def flush_threads(self, include_running=False):
+        """Emit the partial lines buffered by threads that have exited (by every thread if `include_running`),
+        and forget the exited threads' buffers."""
+        leftovers = []
+        with self._buffers_lock:
+            for thread, buf in list(self._buffers.items()):
+                if thread.is_alive():
+                    if not include_running:
+                        continue
+                else:
+                    del self._buffers[thread]
+                pending = buf.getvalue()
+                if pending:
+                    self._drain(buf)
+                    leftovers.append(pending)
+        for pending in leftovers:
+            self._emit(pending)
             
     def fileno(self):
         # Return the stored fileno
@@ -38,48 +102,113 @@ class PrintToLogger:
     
     def isatty(self):
         # Check if the original stream is a terminal
-        if self._is_stderr:
-            return self._stderr.isatty()
-        else:
-            return self._stdout.isatty()
+        return self._stream.isatty()
 
-def silence_loggers(logger_names):
-    """Silence specific loggers by setting them to WARNING level"""
+def silence_loggers(logger_names, mode="warn"):
+    """Silence specific loggers.
+
+    mode="warn" keeps their warnings and errors. mode="off" drops everything: the level check fails before a record
+    is even created, and nothing propagates to the root handlers.
+    """
     for logger_name in logger_names:
-        logging.getLogger(logger_name).setLevel(logging.WARNING)
+        logger = logging.getLogger(logger_name)
+        if mode == "off":
+            logger.setLevel(logging.CRITICAL + 1)
+            logger.propagate = False
+        else:
+            logger.setLevel(logging.WARNING)
+
+class _SharedFormatter(logging.Formatter):
+    """Formatter that formats each record once and hands the same text to every handler using it"""
+    def format(self, record):
+        cached = record.__dict__.get("_shared_format")
+        if cached is None or cached[0] is not self:
+            cached = record._shared_format = (self, super().format(record))
+        return cached[1]
+
+def _not_stderr(record):
+    """Captured stderr only belongs in error.log"""
+    return record.name != "stderr"
+
+_listener = None
+_log_queue = None
+
+def _flush_print_buffers(include_running=False):
+    for stream in (sys.stdout, sys.stderr):
+        if isinstance(stream, PrintToLogger):
+            stream.flush_threads(include_running)
+
+def _stop_listener():
+    global _listener
+    if _listener is not None:
+        # Nothing is written to the log files after this, so emit every thread's partial line now
+        _flush_print_buffers(include_running=True)
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+atexit.register(_stop_listener)
+
+def flush_logs():
+    """Block until every record logged so far has been written to the log files.
+
+    Use before reading the run's logs (e.g. to hand them to the judge) while the listener is running.
+    """
+    if _listener is None:
+        return
+    # Partial lines printed by threads that have since exited are still sitting in their buffers
+    _flush_print_buffers()
+    _log_queue.join()
+    for handler in _listener.handlers:
+        handler.flush()
 
 def setup_logging(run_dir: Path):
-    """Set up comprehensive logging configuration for the run"""
-    # Configure main logging
-    log_format = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-    logging.basicConfig(
-        level=logging.INFO,
-        format=log_format,
-        handlers=[
-            logging.FileHandler(run_dir / "all.log"),
-            logging.StreamHandler()
-        ],
-        force=True
-    )
+    """Set up comprehensive logging configuration for the run.
 
-    # Add separate log files for info and errors
-    root_logger = logging.getLogger()
-    
+    Loggers only enqueue records; a background listener formats each record once and writes it to all.log,
+    info.log, error.log and the console.
+    """
+    global _listener, _log_queue
+    _stop_listener()
+
+    # The log format doesn't include thread or process details, so skip collecting them on every record
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+
+    # One formatter, shared by every handler
+    formatter = _SharedFormatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    all_handler = logging.FileHandler(run_dir / "all.log")
+    console_handler = logging.StreamHandler()
     info_handler = logging.FileHandler(run_dir / "info.log")
     info_handler.setLevel(logging.INFO)
-    info_handler.setFormatter(logging.Formatter(log_format))
-    root_logger.addHandler(info_handler)
-    
     error_handler = logging.FileHandler(run_dir / "error.log")
     error_handler.setLevel(logging.ERROR)
-    error_handler.setFormatter(logging.Formatter(log_format))
-    root_logger.addHandler(error_handler)
-    
-    # Configure stderr logger to use the same error.log file
+
+    for handler in (all_handler, console_handler, info_handler, error_handler):
+        handler.setFormatter(formatter)
+    for handler in (all_handler, console_handler, info_handler):
+        handler.addFilter(_not_stderr)
+
+    # A joinable queue (rather than SimpleQueue) so `flush_logs` can wait for the listener to catch up
+    _log_queue = queue.Queue()
+    _listener = logging.handlers.QueueListener(
+        _log_queue, all_handler, console_handler, info_handler, error_handler, respect_handler_level=True
+    )
+    _listener.start()
+
+    root_logger = logging.getLogger()
+    for handler in root_logger.handlers[:]:
+        root_logger.removeHandler(handler)
+        handler.close()
+    root_logger.addHandler(logging.handlers.QueueHandler(_log_queue))
+    root_logger.setLevel(logging.INFO)
+
+    # Captured stderr goes to the same queue, where it is routed to error.log only
     stderr_logger = logging.getLogger("stderr")
-    stderr_logger.addHandler(error_handler)
     stderr_logger.setLevel(logging.ERROR)
-    stderr_logger.propagate = False  # Prevent duplication with root logger
 
 def redirect_stdout_stderr():
     """Redirect stdout/stderr to logging (only if not in subprocess)"""
@@ -1,16 +1,27 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
 from typing import Optional, Callable, List, Dict, Any
 from functools import wraps
 import inspect
 
+# Inputs and results are never modified once built; frozen instances are also hashable, so they can key caches
+IMMUTABLE = ConfigDict(frozen=True, extra='ignore')
+
 class Task(BaseModel):
+  model_config = IMMUTABLE
+
   task_id: str = Field(..., example="update_readme")
   task: str = Field(..., example="Update the README.md to describe the repository. Create the README.md if it doesn't exist")
   success_criteria: Optional[str] = Field(None, example="README.md exists and contains at least 100 words describing the repository's purpose, structure, and usage")
   ms: Optional[int] = Field(None, example=3600000)
   dir_name: Optional[str] = Field(None, description="Directory name of the env folder to clone and the eval folder to evaluate with", example="dummy_env")
+  readonly_env: bool = Field(False, description="The agent only reads the env, so its copy may hardlink the source files instead of copying them")
+
+# Parses and validates a whole tasks file in one pass
+TaskList = TypeAdapter(List[Task])
 
 class AgentResult(BaseModel):
+    model_config = IMMUTABLE
+
     completed: bool = Field(..., description="Whether the experiment was completed")
     result: str = Field(..., description="The result of the experiment")
     input_tokens: Optional[int] = Field(None, description="The number of input tokens used by the agent")
@@ -19,6 +30,8 @@ class AgentResult(BaseModel):
     reasoning: str = Field(..., description="The reasoning of the agent")
 
 class EvalResult(BaseModel):
+  model_config = IMMUTABLE
+
   passed: bool = Field(..., description="Whether the task succeeded")
   result: str = Field(..., description="Detailed explanation of the evaluation result")
 
@@ -35,7 +48,7 @@ class RunSummary(BaseModel):
   run_dir: str = Field(..., description="Directory where run outputs are stored")
   total_time: str = Field(..., description="Total execution time in seconds", example="56.03s")
   total_score: str = Field(..., description="Score as completed/total tasks", example="1/1")
-  task_logs: List[TaskLog] = Field(..., description="Detailed logs for each task")
+  task_logs_file: str = Field(..., description="JSON Lines file with the TaskLog of each task, appended in task order as tasks finish", example="runs/1_example_20250101120000/task_logs.jsonl")
   # Optional fields - only included when data is available
   input_tokens: Optional[int] = Field(None, description="Total input tokens across all tasks")
   output_tokens: Optional[int] = Field(None, description="Total output tokens across all tasks")
@@ -43,6 +56,8 @@ class RunSummary(BaseModel):
   total_cost: Optional[float] = Field(None, description="Total cost across all tasks")
 
 class Run(BaseModel):
+  model_config = IMMUTABLE
+
   task: Task
   agent_name: str
   task_file: str
@@ -53,24 +68,34 @@ class Run(BaseModel):
 EvalFunction = Callable[[Run], EvalResult]
 
 def eval_function(func: EvalFunction) -> EvalFunction:
-  """Decorator to mark a function as an evaluation function."""
+  """
+  Decorator to mark a function as an evaluation function.
+  The wrapper's `_is_eval_function` lets the runner find it among an eval module's attributes, including when
+  it is defined in a helper module and imported into the eval.py.
+  """
   @wraps(func)
   def wrapper(r: Run) -> EvalResult:
     return func(r)
+  wrapper._is_eval_function = True
   return wrapper
 
 # Type alias for agent main functions
 AgentMainFunction = Callable[[Run], AgentResult]
 
 def agent_main(func):
-  """Decorator to mark a function as an agent main function. Handles both sync and async functions."""
+  """
+  Decorator to mark a function as an agent main function. Handles both sync and async functions.
+  The wrapper's `_is_async` tells the runner which kind it is without inspecting it again.
+  """
   if inspect.iscoroutinefunction(func):
     @wraps(func)
     async def async_wrapper(r: Run) -> AgentResult:
       return await func(r)
+    async_wrapper._is_async = True
     return async_wrapper
   else:
     @wraps(func)
     def sync_wrapper(r: Run) -> AgentResult:
       return func(r)
+    sync_wrapper._is_async = False
     return sync_wrapper
\ No newline at end of file
@@ -1,36 +1,172 @@
 import os
+import stat
+import uuid
 import fcntl
-from datetime import datetime
+import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+# (epoch second, "YYYYMMDDHHMMSS") of the last call; localtime is only needed once the second changes
+_datetime_prefix = (None, "")
+
 def get_formatted_datetime() -> str:
-  return datetime.now().strftime("%Y%m%d%H%M%S%f")[:18]
+  """Local time as YYYYMMDDHHMMSS plus the first four digits of the microseconds."""
+  global _datetime_prefix
+  seconds, ns = divmod(time.time_ns(), 1_000_000_000)
+  cached_seconds, prefix = _datetime_prefix
+  if seconds != cached_seconds:
+    t = time.localtime(seconds)
+    prefix = f"{t.tm_year:04d}{t.tm_mon:02d}{t.tm_mday:02d}{t.tm_hour:02d}{t.tm_min:02d}{t.tm_sec:02d}"
+    _datetime_prefix = (seconds, prefix)
+  return f"{prefix}{ns // 100_000:04d}"
+
+def _seed_experiment_counter(counter_file: Path, legacy_file: Path) -> None:
+  """
+  Creates the counter file, carrying over the number stored in the old `next_exp_number` file if there is one.
+  The seeded file is built under a temp name and linked into place, so concurrent first calls agree on one seed.
+  """
+  try:
+    next_num = int(legacy_file.read_text().strip() or "1")
+  except (FileNotFoundError, ValueError):
+    next_num = 1
+
+  tmp_path = counter_file.with_name(f".{counter_file.name}.{uuid.uuid4().hex}.tmp")
+  fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+  try:
+    # The counter is the file's size, so a (sparse) file of next_num - 1 bytes hands out next_num next
+    os.ftruncate(fd, next_num - 1)
+  finally:
+    os.close(fd)
+  try:
+    os.link(tmp_path, counter_file)
+  except FileExistsError:
+    # Another process seeded it first
+    pass
+  finally:
+    os.unlink(tmp_path)
 
 def get_next_experiment_number() -> int:
   """
   Gets the next experiment number and increments the counter.
-  Uses file locking to ensure thread safety.
+  The counter is the size of an append-only file: every call appends one byte with O_APPEND,
+  which the kernel applies atomically, so concurrent callers get distinct numbers without a lock.
   Returns the original number before incrementing.
   """
-  exp_file = Path(__file__).parent / "next_exp_number"
-  
-  # Create file if it doesn't exist
-  if not exp_file.exists():
-    exp_file.write_text("1")
-  
-  with open(exp_file, 'r+') as f:
-    # Get an exclusive lock
-    fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+  helpers_dir = Path(__file__).parent
+  counter_file = helpers_dir / "exp_counter"
+
+  while True:
     try:
-      # Read current number
-      current_num = int(f.read().strip() or "1")
-      
-      # Seek to beginning and write incremented number
-      f.seek(0)
-      f.write(str(current_num + 1))
-      f.truncate()
-      
-      return current_num
+      fd = os.open(counter_file, os.O_WRONLY | os.O_APPEND)
+      break
+    except FileNotFoundError:
+      _seed_experiment_counter(counter_file, helpers_dir / "next_exp_number")
+
+  try:
+    os.write(fd, b".")
+    # Our own offset ends right after the byte we appended; the file's size may already include later appends
+    return os.lseek(fd, 0, os.SEEK_CUR)
+  finally:
+    os.close(fd)
+
+def stat_or_none(path):
+  """`os.stat(path)`, or None if it doesn't exist. Saves a separate exists() stat when the stat result is needed anyway."""
+  try:
+    return os.stat(path)
+  except FileNotFoundError:
+    return None
+
+def atomic_write_bytes(path, data: bytes) -> None:
+  """
+  Writes `data` to `path` through a temp file in the same directory and `os.replace`,
+  so readers never observe a partially written file.
+  Keeps the permissions of the file being replaced; new files get the usual umask-derived mode.
+  """
+  dir_name = os.path.dirname(path) or "."
+  tmp_path = os.path.join(dir_name, f".{os.path.basename(path)}.{uuid.uuid4().hex}.tmp")
+  fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+  try:
+    try:
+      # os.write may write less than asked for, so keep going until everything is out
+      view = memoryview(data)
+      while view:
+        view = view[os.write(fd, view):]
     finally:
-      # Release the lock
-      fcntl.flock(f.fileno(), fcntl.LOCK_UN) 
\ No newline at end of file
+      os.close(fd)
+    if os.path.exists(path):
+      os.chmod(tmp_path, stat.S_IMODE(os.stat(path).st_mode))
+    os.replace(tmp_path, path)
+  except BaseException:
+    # Don't leave the temp file behind if anything failed before the rename
+    if os.path.exists(tmp_path):
+      os.unlink(tmp_path)
+    raise
+
+def atomic_write_text(path, content: str) -> None:
+  """Encodes `content` as UTF-8 once and writes it with `atomic_write_bytes`."""
+  atomic_write_bytes(path, content.encode("utf-8"))
+
+# Linux ioctl that makes `dst` share `src`'s extents (btrfs, XFS, bcachefs, ...)
+FICLONE = 0x40049409
+
+def _copy_file_range(src_fd: int, dst_fd: int) -> None:
+  remaining = os.fstat(src_fd).st_size
+  while remaining > 0:
+    copied = os.copy_file_range(src_fd, dst_fd, remaining)
+    if copied == 0:
+      break
+    remaining -= copied
+
+def reflink_copy2(src, dst) -> str:
+  """
+  Drop-in for `shutil.copy2` (e.g. as `copytree`'s `copy_function`) that avoids copying file data where it can.
+  Tries a copy-on-write clone first, then an in-kernel `copy_file_range`, then falls back to `shutil.copy2`.
+  Returns the destination path.
+  """
+  if os.path.isdir(dst):
+    dst = os.path.join(dst, os.path.basename(src))
+  try:
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+      try:
+        fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+      except OSError:
+        # Not supported by this filesystem (or across filesystems)
+        _copy_file_range(fsrc.fileno(), fdst.fileno())
+  except (OSError, AttributeError):
+    # AttributeError: no os.copy_file_range on this platform
+    return shutil.copy2(src, dst)
+  shutil.copystat(src, dst)
+  return dst
+
+def link_or_copy2(src, dst) -> str:
+  """
+  `copytree` copy function for envs that are only read: hardlinks `src` to `dst`, so no data is copied at all.
+  Falls back to `reflink_copy2` where hardlinks aren't possible (e.g. across filesystems).
+  Anything written in place through the link also changes the source, so only use it for read-only envs.
+  """
+  if os.path.isdir(dst):
+    dst = os.path.join(dst, os.path.basename(src))
+  try:
+    os.link(src, dst)
+  except OSError:
+    return reflink_copy2(src, dst)
+  return dst
+
+# Deletes discarded trees in the background; its thread is joined at exit, so nothing is left half deleted
+_discard_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="discard-tree")
+
+def discard_tree(path) -> None:
+  """
+  Removes the directory tree at `path` without waiting for it to be deleted.
+  The tree is renamed to a hidden tombstone next to it (a single syscall), which frees `path` right away,
+  and the tombstone is deleted on a background thread.
+  """
+  path = os.fspath(path)
+  parent, name = os.path.split(path)
+  tombstone = os.path.join(parent, f".{name}.{uuid.uuid4().hex}.deleted")
+  try:
+    os.rename(path, tombstone)
+  except FileNotFoundError:
+    return
+  _discard_executor.submit(shutil.rmtree, tombstone, ignore_errors=True)
@@ -2,20 +2,87 @@ import os
 import argparse
 import json
 import importlib
-import importlib.util
 import logging
 import time
 import shutil
 import sys
 import asyncio
 import inspect
+import functools
+import contextvars
+import threading
+from concurrent.futures import Future
 from pathlib import Path
 
-from helpers.models import Task, Run, RunSummary, TaskLog
-from helpers.utils import get_next_experiment_number, get_formatted_datetime
-from helpers.llm_as_a_judge import evaluate_task
+from pydantic import ValidationError
+
+from helpers.models import Task, TaskList, Run, RunSummary, TaskLog, AgentResult
+from helpers.utils import get_next_experiment_number, get_formatted_datetime, reflink_copy2, link_or_copy2, stat_or_none, discard_tree
+from helpers.eval_runner import load_eval_function, run_isolated
 from helpers.logger import setup_logging, silence_loggers, redirect_stdout_stderr
 
+@functools.lru_cache(maxsize=8)
+def _load_agent(name):
+    """Import an agent's main() function, once per process"""
+    return importlib.import_module(f"agents.{name}.main").main
+
+@functools.lru_cache(maxsize=32)
+def _load_eval_function(module_name, path, mtime_ns):
+    """Import an eval.py and return its evaluation function, or None if it has none.
+
+    `mtime_ns` is only part of the cache key, so an edited eval file is imported afresh.
+    """
+    return load_eval_function(module_name, path)
+
+@functools.lru_cache(maxsize=32)
+def _load_tasks(path, mtime_ns):
+    """Parse a task file, once per path and modification time.
+
+    Returns a tuple of tasks (validated `Task`s, or raw entries when some of them are invalid), or the parsed
+    value as is if the file isn't a JSON array.
+    """
+    task_bytes = Path(path).read_bytes()
+    try:
+        # Parse and validate every task in one pass
+        return tuple(TaskList.validate_json(task_bytes))
+    except ValidationError:
+        # Some entry is invalid (or this isn't a list); fall back to validating task by task so only bad tasks fail
+        tasks = json.loads(task_bytes)
+    return tuple(tasks) if isinstance(tasks, list) else tasks
+
+def _close_event_loop(loop):
+    """Tear down a loop the way `asyncio.run` does: cancel leftover tasks, then shut down generators and the executor"""
+    try:
+        pending = asyncio.all_tasks(loop)
+        for task in pending:
+            task.cancel()
+        if pending:
+            loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+        loop.run_until_complete(loop.shutdown_asyncgens())
+        loop.run_until_complete(loop.shutdown_default_executor())
+    finally:
+        asyncio.set_event_loop(None)
+        loop.close()
+
+def _run_on_daemon_thread(fn, *args, name=None):
+    """Run `fn(*args)` on a new daemon thread and return a Future for its result.
+
+    Unlike executor threads, daemon threads aren't joined at interpreter exit, so an interrupted run exits without
+    waiting for the agents still running.
+    """
+    future = Future()
+
+    def target():
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(fn(*args))
+        except BaseException as e:
+            future.set_exception(e)
+
+    threading.Thread(target=target, name=name, daemon=True).start()
+    return future
+
 def cli_main():
     """CLI entry point for the tag command"""
     parser = argparse.ArgumentParser(
@@ -28,6 +95,8 @@ Examples:
   tag --task example
   tag "Improve the code" --env example
   tag "Complex task" --agent react_with_mcp
+  tag --task example --parallel 4
+  tag --task example --isolate-evals
         """
     )
     
@@ -65,6 +134,19 @@ Examples:
         help="Agent name (default: react)"
     )
     
+    parser.add_argument(
+        "--parallel", 
+        type=int,
+        default=1,
+        help="Number of tasks to run concurrently (default: 1)"
+    )
+    
+    parser.add_argument(
+        "--isolate-evals", 
+        action="store_true",
+        help="Run each task-specific eval.py in its own process"
+    )
+    
     args = parser.parse_args()
     
     # Validate arguments
@@ -99,6 +181,8 @@ def run_task(cli_args):
         class Args:
             def __init__(self):
                 self.agent = cli_args.agent
+                self.parallel = cli_args.parallel
+                self.isolate_evals = cli_args.isolate_evals
                 self.tasks = task_name
     else:
         # Create new task from description
@@ -158,6 +242,8 @@ def run_task(cli_args):
         class Args:
             def __init__(self):
                 self.agent = cli_args.agent
+                self.parallel = cli_args.parallel
+                self.isolate_evals = cli_args.isolate_evals
                 self.tasks = task_file_name
     
     # Run the main execution
@@ -167,7 +253,7 @@ def main_execution(args):
     print("🚀 Starting AI Scientist Gym...")
     
     # Silence specific loggers
-    silence_loggers(["LiteLLM"])
+    silence_loggers(["LiteLLM"], mode="off")
     
     # Generate unique run directory automatically
     exp_num = get_next_experiment_number()
@@ -189,12 +275,11 @@ def main_execution(args):
     input_tokens = 0
     output_tokens = 0
     total_cost = 0
-    task_logs = []
+    completed_tasks = 0
 
     # Import the agent's main function
     try:
-        agent_module = importlib.import_module(f"agents.{args.agent}.main")
-        agent_main = agent_module.main
+        agent_main = _load_agent(args.agent)
         logger.info(f"Successfully imported agent: {args.agent}")
     except ImportError as e:
         print(f"❌ Failed to import agent {args.agent}: {e}")
@@ -211,155 +296,262 @@ def main_execution(args):
         print(f"❌ Task file not found: {task_file}")
         raise FileNotFoundError(f"Task file {task_file} does not exist")
     
-    with open(task_file) as f:
-        tasks = json.load(f)
-        if not isinstance(tasks, list):
-            print(f"❌ Task file must contain JSON array, got: {type(tasks)}")
-            raise ValueError(f"Task file {task_file} must contain a JSON array")
+    # Parsed once per file version; repeated runs on an unchanged file reuse the tasks
+    tasks = _load_tasks(str(task_file), task_file.stat().st_mtime_ns)
+    if not isinstance(tasks, tuple):
+        print(f"❌ Task file must contain JSON array, got: {type(tasks)}")
+        raise ValueError(f"Task file {task_file} must contain a JSON array")
+    
+    print(f"📋 Loaded {len(tasks)} tasks")
+
+    # Imported here rather than at the top: they pull in dspy and litellm, which `--help` and early failures don't need
+    from helpers.ai import history_scope, HistoryScope
+    from helpers.llm_as_a_judge import start_evaluation
+    
+    # Tasks run as coroutines on one event loop, at most `parallel` at a time
+    parallel = max(1, getattr(args, 'parallel', 1) or 1)
+    isolate_evals = getattr(args, 'isolate_evals', False)
+    # Decided once per run; @agent_main already records it, undecorated mains are inspected
+    is_async_agent = getattr(agent_main, "_is_async", None)
+    if is_async_agent is None:
+        is_async_agent = inspect.iscoroutinefunction(agent_main)
+
+    # Existing env directories, read with one scandir instead of a stat per task
+    try:
+        with os.scandir("envs") as entries:
+            env_dirs = {entry.name for entry in entries if entry.is_dir()}
+    except FileNotFoundError:
+        env_dirs = set()
+
+    async def prepare_env(i, task_dict):
+        """Validate task `i` and set up its environment directory (clone if specified, create if not)"""
+        task = task_dict if isinstance(task_dict, Task) else Task.model_validate(task_dict)
+        logger.info(f"Running task: {task}")
+
+        # Envs are prepared ahead of their task, so each task of a multi-task run gets its own directory
+        env_suffix = f"_task{i}" if len(tasks) > 1 else ""
+        if task.dir_name:
+            source_env_dir = Path("envs") / task.dir_name
+            # Nested dir names aren't in `env_dirs`, so those still get a stat
+            if task.dir_name not in env_dirs and not source_env_dir.is_dir():
+                print(f"❌ Source environment directory not found: {source_env_dir}")
+                raise FileNotFoundError(f"Source environment directory {source_env_dir} does not exist")
+
+            cloned_env_dir = Path("envs") / f"{task.dir_name}_{instance_id}{env_suffix}"
+            # `env_dirs` only covers the top level of envs/; a nested clone (dir_name with a separator) gets a stat
+            if cloned_env_dir.parent == Path("envs"):
+                stale_clone = cloned_env_dir.name in env_dirs
+            else:
+                stale_clone = stat_or_none(cloned_env_dir) is not None
+            if stale_clone:
+                # A leftover copy is only moved out of the way here; it is deleted in the background
+                discard_tree(cloned_env_dir)
+            # Read-only envs can share the source files through hardlinks
+            copy_function = link_or_copy2 if task.readonly_env else reflink_copy2
+            await asyncio.to_thread(
+                shutil.copytree, source_env_dir, cloned_env_dir, copy_function=copy_function
+            )
+            logger.info(f"Cloned environment from {source_env_dir} to {cloned_env_dir}")
+        else:
+            cloned_env_dir = Path("envs") / f"{instance_id}{env_suffix}"
+            os.makedirs(cloned_env_dir, exist_ok=True)
+            logger.info(f"Created new environment directory: {cloned_env_dir}")
+        return task, cloned_env_dir
+
+    async def run_one(i, task_dict, semaphore, env_slots):
+        """Run, evaluate and log task `i`. Returns its TaskLog, or None if it failed"""
+        nonlocal input_tokens, output_tokens, total_cost, completed_tasks
+        # One more env slot than agent slots: the next task's env is cloned while the running tasks' agents work
+        async with env_slots:
+            try:
+                task, cloned_env_dir = await prepare_env(i, task_dict)
+            except Exception as e:
+                print(f"❌ Error processing task {i}: {e}")
+                logger.error(f"Error processing task {i}: {e}", exc_info=True)
+                return None
+
+            async with semaphore:
+                logger.info(f"Processing task {i}/{len(tasks)}")
+
+                # LM calls made while running this task are attributed to it
+                history_scope.set(HistoryScope())
+
+                try:
+                    # Run the task
+                    task_start = time.time()
+                    # Built from already-validated parts, so skip validation
+                    run_data = Run.model_construct(
+                        task=task,
+                        agent_name=args.agent,
+                        task_file=str(task_file),
+                        run_dir=str(run_dir),
+                        dir_name=str(cloned_env_dir)
+                    )
         
-        print(f"📋 Loaded {len(tasks)} tasks")
+                    if is_async_agent:
+                        result = await agent_main(run_data)
+                    else:
+                        # Sync agents each get their own daemon thread (the semaphore bounds how many), so no event
+                        # loop is running where they execute (they may call asyncio.run themselves), they never queue
+                        # behind env copies and evals on the default executor, and Ctrl-C isn't held up by them. The
+                        # task's context (and with it its LM history scope) is carried over explicitly
+                        context = contextvars.copy_context()
+                        result = await asyncio.wrap_future(
+                            _run_on_daemon_thread(context.run, agent_main, run_data, name=f"agent-task{i}")
+                        )
         
-        for i, task_dict in enumerate(tasks, 1):
-            print(f"\n🔄 Processing task {i}/{len(tasks)}")
-            logger.info(f"Processing task {i}")
-            
-            try:
-                task = Task(**task_dict)
-                logger.info(f"Running task: {task}")
-                
-                # Setup environment directory (clone if specified, create if not)
-                if task.dir_name:
-                    source_env_dir = Path("envs") / task.dir_name
-                    if not source_env_dir.exists():
-                        print(f"❌ Source environment directory not found: {source_env_dir}")
-                        raise FileNotFoundError(f"Source environment directory {source_env_dir} does not exist")
+                    task_time = time.time() - task_start
+                    logger.info(f"Completed task {i} in {task_time:.2f}s")
+        
+                    # Update token counts if agent returns them (only count actual values, not null/missing)
+                    task_input_tokens = None
+                    task_output_tokens = None
+                    task_cost = None
+        
+                    if isinstance(result, dict):
+                        task_input_tokens = result.get('input_tokens')
+                        task_output_tokens = result.get('output_tokens')
+                        task_cost = result.get('cost')
+                    elif result and hasattr(result, 'input_tokens'):
+                        task_input_tokens = getattr(result, 'input_tokens', None)
+                        task_output_tokens = getattr(result, 'output_tokens', None)
+                        task_cost = getattr(result, 'cost', None)
+        
+                    # Only add to totals if we have actual values (not None/null)
+                    if task_input_tokens is not None and task_input_tokens > 0:
+                        input_tokens += task_input_tokens
+                    if task_output_tokens is not None and task_output_tokens > 0:
+                        output_tokens += task_output_tokens
+                    if task_cost is not None and task_cost > 0:
+                        total_cost += task_cost
+        
+                    # Log with proper null handling
+                    input_str = str(task_input_tokens) if task_input_tokens is not None else "null"
+                    output_str = str(task_output_tokens) if task_output_tokens is not None else "null"
+                    cost_str = str(task_cost) if task_cost is not None else "null"
+                    logger.info(f"Token usage - Input: {input_str}, Output: {output_str}, Cost: {cost_str}")
+
+                    # Start the LLM-based evaluation; the judge call runs in the background during the task-specific evaluation
+                    llm_eval_result = None
+                    llm_eval_future = None
+                    try:
+                        logger.info(f"Running LLM evaluation for task {i}")
+                        # Waiting for the log files to catch up and reading them happens off the event loop
+                        llm_eval_future = await asyncio.to_thread(start_evaluation, task, str(run_dir))
+                    except Exception as e:
+                        print(f"❌ LLM evaluation failed: {e}")
+                        logger.error(f"Error running LLM evaluation for task {i}: {e}", exc_info=True)
+
+                    # Run task-specific evaluation if eval file exists
+                    eval_result = None
+                    if task.dir_name:
+                        eval_file_path = Path("evals") / task.dir_name / "eval.py"
+                        eval_file_stat = stat_or_none(eval_file_path)
+                        if eval_file_stat is not None:
+                            try:
+                                logger.info(f"Running task-specific evaluation for task {i}")
+                                eval_file_path_str = str(eval_file_path.resolve())
+                                if isolate_evals:
+                                    # A fresh interpreter per evaluation; nothing from eval.py is imported here
+                                    eval_result = await run_isolated(eval_file_path_str, run_data)
+                                    found_eval_function = eval_result is not None
+                                else:
+                                    # Import the evaluation module directly from file path (cached until the file changes)
+                                    eval_module_name = f"eval_{task.dir_name.replace('/', '_')}"
                     
-                    cloned_env_dir = Path("envs") / f"{task.dir_name}_{instance_id}"
-                    if cloned_env_dir.exists():
-                        shutil.rmtree(cloned_env_dir)
-                    shutil.copytree(source_env_dir, cloned_env_dir)
-                    logger.info(f"Cloned environment from {source_env_dir} to {cloned_env_dir}")
-                else:
-                    cloned_env_dir = Path("envs") / instance_id
-                    cloned_env_dir.mkdir(parents=True, exist_ok=True)
-                    logger.info(f"Created new environment directory: {cloned_env_dir}")
-                
-                # Run the task
-                task_start = time.time()
-                run_data = Run(
-                    task=task,
-                    agent_name=args.agent,
-                    task_file=str(task_file),
-                    run_dir=str(run_dir),
-                    dir_name=str(cloned_env_dir)
-                )
-                
-                if inspect.iscoroutinefunction(agent_main):
-                    result = asyncio.run(agent_main(run_data))
-                else:
-                    result = agent_main(run_data)
-                
-                task_time = time.time() - task_start
-                logger.info(f"Completed task {i} in {task_time:.2f}s")
-                
-                # Update token counts if agent returns them (only count actual values, not null/missing)
-                task_input_tokens = None
-                task_output_tokens = None
-                task_cost = None
-                
-                if isinstance(result, dict):
-                    task_input_tokens = result.get('input_tokens')
-                    task_output_tokens = result.get('output_tokens')
-                    task_cost = result.get('cost')
-                elif result and hasattr(result, 'input_tokens'):
-                    task_input_tokens = getattr(result, 'input_tokens', None)
-                    task_output_tokens = getattr(result, 'output_tokens', None)
-                    task_cost = getattr(result, 'cost', None)
-                
-                # Only add to totals if we have actual values (not None/null)
-                if task_input_tokens is not None and task_input_tokens > 0:
-                    input_tokens += task_input_tokens
-                if task_output_tokens is not None and task_output_tokens > 0:
-                    output_tokens += task_output_tokens
-                if task_cost is not None and task_cost > 0:
-                    total_cost += task_cost
-                
-                # Log with proper null handling
-                input_str = str(task_input_tokens) if task_input_tokens is not None else "null"
-                output_str = str(task_output_tokens) if task_output_tokens is not None else "null"
-                cost_str = str(task_cost) if task_cost is not None else "null"
-                logger.info(f"Token usage - Input: {input_str}, Output: {output_str}, Cost: {cost_str}")
-
-                # Run LLM-based evaluation
-                llm_eval_result = None
-                try:
-                    logger.info(f"Running LLM evaluation for task {i}")
-                    llm_eval_result = evaluate_task(task, str(run_dir))
-                    logger.info(f"LLM evaluation completed for task {i}: passed={llm_eval_result.passed}")
-                except Exception as e:
-                    print(f"❌ LLM evaluation failed: {e}")
-                    logger.error(f"Error running LLM evaluation for task {i}: {e}", exc_info=True)
-
-                # Run task-specific evaluation if eval file exists
-                eval_result = None
-                if task.dir_name:
-                    eval_file_path = Path("evals") / task.dir_name / "eval.py"
-                    if eval_file_path.exists():
+                                    # Add current directory to sys.path to ensure imports work in eval.py
+                                    current_dir = str(Path.cwd())
+                                    if current_dir not in sys.path:
+                                        sys.path.insert(0, current_dir)
+                    
+                                    eval_function = _load_eval_function(
+                                        eval_module_name, eval_file_path_str, eval_file_stat.st_mtime_ns
+                                    )
+                                    found_eval_function = eval_function is not None
+                                    if found_eval_function:
+                                        eval_result = await asyncio.to_thread(eval_function, run_data)
+                    
+                                if found_eval_function:
+                                    logger.info(f"Task-specific evaluation completed for task {i}: passed={eval_result.passed}")
+                                else:
+                                    logger.warning(f"No eval function found in {eval_file_path}")
+                        
+                            except Exception as e:
+                                print(f"❌ Task-specific evaluation failed: {e}")
+                                logger.error(f"Error running task-specific evaluation for task {i}: {e}", exc_info=True)
+                        else:
+                            logger.info(f"No task-specific evaluation file found at {eval_file_path}")
+
+                    # Collect the LLM evaluation
+                    if llm_eval_future is not None:
                         try:
-                            logger.info(f"Running task-specific evaluation for task {i}")
-                            # Import the evaluation module directly from file path
-                            eval_file_path_str = str(eval_file_path)
-                            eval_module_name = f"eval_{task.dir_name.replace('/', '_')}"
-                            
-                            # Add current directory to sys.path to ensure imports work in eval.py
-                            current_dir = str(Path.cwd())
-                            if current_dir not in sys.path:
-                                sys.path.insert(0, current_dir)
-                            
-                            spec = importlib.util.spec_from_file_location(eval_module_name, eval_file_path_str)
-                            eval_module = importlib.util.module_from_spec(spec)
-                            spec.loader.exec_module(eval_module)
-                            
-                            # Find the evaluation function (look for functions decorated with @eval_function)
-                            eval_function = None
-                            for attr_name in dir(eval_module):
-                                attr = getattr(eval_module, attr_name)
-                                if callable(attr) and hasattr(attr, '__wrapped__'):
-                                    eval_function = attr
-                                    break
-                            
-                            if eval_function:
-                                eval_result = eval_function(run_data)
-                                logger.info(f"Task-specific evaluation completed for task {i}: passed={eval_result.passed}")
-                            else:
-                                logger.warning(f"No eval function found in {eval_file_path}")
-                                
+                            llm_eval_result = await asyncio.wrap_future(llm_eval_future)
+                            logger.info(f"LLM evaluation completed for task {i}: passed={llm_eval_result.passed}")
                         except Exception as e:
-                            print(f"❌ Task-specific evaluation failed: {e}")
-                            logger.error(f"Error running task-specific evaluation for task {i}: {e}", exc_info=True)
-                    else:
-                        logger.info(f"No task-specific evaluation file found at {eval_file_path}")
-
-                # Log task details using TaskLog model
-                task_log = TaskLog(
-                    task_id=i,
-                    task=task,  # Use the Task object directly
-                    ms=task_time * 1000,
-                    result=result,  # Pass the AgentResult object directly
-                    llm_evaluation=llm_eval_result,  # Pass the EvalResult object directly
-                    evaluation=eval_result  # Pass the EvalResult object directly
-                )
-                task_logs.append(task_log)
-                
-            except Exception as e:
-                print(f"❌ Error processing task {i}: {e}")
-                logger.error(f"Error processing task {i}: {e}", exc_info=True)
+                            print(f"❌ LLM evaluation failed: {e}")
+                            logger.error(f"Error running LLM evaluation for task {i}: {e}", exc_info=True)
+
+                    # Log task details using TaskLog model
+                    # Agents may return a plain dict; that is the only part that still needs validating
+                    if isinstance(result, dict):
+                        result = AgentResult.model_validate(result)
+                    task_log = TaskLog.model_construct(
+                        task_id=i,
+                        task=task,  # Use the Task object directly
+                        ms=task_time * 1000,
+                        result=result,  # Pass the AgentResult object directly
+                        llm_evaluation=llm_eval_result,  # Pass the EvalResult object directly
+                        evaluation=eval_result  # Pass the EvalResult object directly
+                    )
+                    if result and result.completed:
+                        completed_tasks += 1
+                    return task_log
+        
+                except Exception as e:
+                    print(f"❌ Error processing task {i}: {e}")
+                    logger.error(f"Error processing task {i}: {e}", exc_info=True)
+                    return None
+
+    # Task logs are appended in task order, one write per task, as soon as the task and all tasks before it are done
+    pending_task_logs = {}
+    next_task_log = 1
+
+    def record_task_log(i, task_log):
+        nonlocal next_task_log
+        pending_task_logs[i] = task_log
+        while next_task_log in pending_task_logs:
+            ready = pending_task_logs.pop(next_task_log)
+            if ready is not None:
+                os.write(task_logs_fd, TaskLog.__pydantic_serializer__.to_json(ready, exclude_none=True) + b"\n")
+            next_task_log += 1
+
+    async def run_and_record(i, task_dict, semaphore, env_slots):
+        task_log = await run_one(i, task_dict, semaphore, env_slots)
+        record_task_log(i, task_log)
+        return task_log
+
+    async def run_all():
+        semaphore = asyncio.Semaphore(parallel)
+        env_slots = asyncio.Semaphore(parallel + 1)
+        return await asyncio.gather(
+            *(run_and_record(i, task_dict, semaphore, env_slots) for i, task_dict in enumerate(tasks, 1))
+        )
+
+    task_logs_path = run_dir / "task_logs.jsonl"
+    task_logs_fd = os.open(task_logs_path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o666)
+
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    try:
+        task_logs = [task_log for task_log in loop.run_until_complete(run_all()) if task_log is not None]
+    finally:
+        _close_event_loop(loop)
+        os.close(task_logs_fd)
 
     # Write summary stats
     total_time = time.time() - start_time
     
-    # Calculate total score (completed tasks / all tasks)
-    completed_tasks = sum(1 for log in task_logs if log.result and log.result.completed)
+    # Calculate total score (completed tasks / all tasks); completed tasks were counted as they finished
     total_tasks = len(task_logs)
     total_score = f"{completed_tasks}/{total_tasks}"
     
@@ -369,7 +561,7 @@ def main_execution(args):
         'run_dir': str(run_dir),
         'total_time': f"{total_time:.2f}s",
         'total_score': total_score,
-        'task_logs': task_logs
+        'task_logs_file': str(task_logs_path)
     }
     
     # Only include token/cost information if we have actual data
@@ -381,8 +573,8 @@ def main_execution(args):
     if total_cost > 0:
         summary_dict['total_cost'] = total_cost
     
-    # Create RunSummary instance
-    summary = RunSummary(**summary_dict)
+    # Create RunSummary instance. Its parts are plain values built above, so skip validation
+    summary = RunSummary.model_construct(**summary_dict)
     
     print(f"\n🏁 All tasks completed!")
     print(f"⏱️ Total time: {total_time:.2f}s")
@@ -402,8 +594,12 @@ def main_execution(args):
     print(f"✅ Total score: {total_score}")
     
     summary_path = run_dir / "summary.json"
-    with open(summary_path, 'w') as f:
-        json.dump(summary.model_dump(exclude_none=True), f, indent=2)
+    # O_DSYNC makes the single write durable on return, so the summary survives a crash right after the run
+    # Serialized straight to UTF-8 bytes by pydantic-core, without an intermediate str
+    summary_bytes = RunSummary.__pydantic_serializer__.to_json(summary, indent=2, exclude_none=True)
+    fd = os.open(summary_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_DSYNC', 0), 0o666)
+    with os.fdopen(fd, 'wb') as f:
+        f.write(summary_bytes)
     
     logger.info("Run completed successfully")
     print("🎉 Run completed!")
@@ -414,6 +610,8 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("--agent", required=True, help="Agent name (e.g., react, react_with_mcp)")
     parser.add_argument("--tasks", required=True, help="Path to tasks file")
+    parser.add_argument("--parallel", type=int, default=1, help="Number of tasks to run concurrently (default: 1)")
+    parser.add_argument("--isolate-evals", action="store_true", help="Run each task-specific eval.py in its own process")
     args = parser.parse_args()
     
     # Run the main execution